@@ -1,156 +1,128 @@
-import csv
-import os
+import asyncio
 
+import httpx
 import pytest
-import requests
-from config import BASE_URL
-from utils import create_table, get_error_message, wait_for_final_status
-
-
-@pytest.fixture
-def test_csv_path():
-    file_path = os.path.join(os.getcwd(), "data", "test_copy_fails.csv")
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    data = [["10", "abc", "20"], ["30", "def", "40"]]
-
-    with open(file_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerows(data)
-
-    return file_path
-
-
-def test_fail_column_count_mismatch_no_mapping(server, test_csv_path):
-    table_name = "width_mismatch"
-    create_table(
-        table_name,
+from config import QUERY_URL
+from utils import (
+    JSON_HEADERS,
+    create_table_async,
+    dump_json,
+    get_query_problems_async,
+    parse_json,
+    wait_for_final_status_async,
+)
+
+THREE_COLUMNS = [
+    {"name": "c1", "type": "INT64"},
+    {"name": "c2", "type": "VARCHAR"},
+    {"name": "c3", "type": "INT64"},
+]
+
+# (table name, table columns, destination columns, source CSV fixture, expected error)
+FAILURE_CASES = [
+    (
+        "width_mismatch",
         [{"name": "c1", "type": "INT64"}, {"name": "c2", "type": "VARCHAR"}],
-    )
-
-    data = {
-        "queryDefinition": {
-            "sourceFilepath": test_csv_path,
-            "destinationTableName": table_name,
-        }
-    }
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
-
-    status = wait_for_final_status(query_id)
-    assert status == "FAILED"
-
-    err = get_error_message(query_id)
-    assert (
-        err
-        == "Mismatch: Table has 2 columns, but CSV has 3. Without mapping, counts must match exactly."
-    )
-
-
-def test_fail_mapping_bad_column_name(server, test_csv_path):
-    table_name = "bad_map_name"
-    create_table(
-        table_name,
-        [
-            {"name": "c1", "type": "INT64"},
-            {"name": "c2", "type": "VARCHAR"},
-            {"name": "c3", "type": "INT64"},
-        ],
-    )
-
-    data = {
-        "queryDefinition": {
-            "sourceFilepath": test_csv_path,
-            "destinationTableName": table_name,
-            "destinationColumns": ["c1", "ghost_col", "c3"],
-        }
-    }
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
-
-    status = wait_for_final_status(query_id)
-    assert status == "FAILED"
-
-    err = get_error_message(query_id)
-    assert err == "Mapping references column 'ghost_col', which does not exist in table"
-
-
-def test_fail_mapping_length_mismatch(server, test_csv_path):
-    table_name = "bad_map_len"
-    create_table(
-        table_name,
-        [
-            {"name": "c1", "type": "INT64"},
-            {"name": "c2", "type": "VARCHAR"},
-            {"name": "c3", "type": "INT64"},
-        ],
-    )
-
-    data = {
-        "queryDefinition": {
-            "sourceFilepath": test_csv_path,
-            "destinationTableName": table_name,
-            "destinationColumns": ["c1", "c2"],
-        }
-    }
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
-
-    status = wait_for_final_status(query_id)
-    assert status == "FAILED"
-
-    err = get_error_message(query_id)
-    assert err == "Mapping have different number of rows then destination table"
-
-
-def test_fail_type_mismatch(server, test_csv_path):
-    table_name = "type_fail"
-    create_table(
-        table_name,
+        None,
+        "test_csv_path",
+        "Mismatch: Table has 2 columns, but CSV has 3. Without mapping, counts must match exactly.",
+    ),
+    (
+        "bad_map_name",
+        THREE_COLUMNS,
+        ["c1", "ghost_col", "c3"],
+        "test_csv_path",
+        "Mapping references column 'ghost_col', which does not exist in table",
+    ),
+    (
+        "bad_map_len",
+        THREE_COLUMNS,
+        ["c1", "c2"],
+        "test_csv_path",
+        "Mapping have different number of rows then destination table",
+    ),
+    (
+        "type_fail",
         [
             {"name": "c1", "type": "INT64"},
             {"name": "c2", "type": "INT64"},
             {"name": "c3", "type": "INT64"},
         ],
-    )
-
-    data = {
-        "queryDefinition": {
-            "sourceFilepath": test_csv_path,
-            "destinationTableName": table_name,
-        }
+        None,
+        "test_csv_path",
+        "Type Error at Row 1, Column 'c2': Expected INT64, got 'abc'",
+    ),
+    (
+        "csv_narrow",
+        [{"name": "c1", "type": "INT64"}, {"name": "c2", "type": "INT64"}],
+        ["c1", "c2"],
+        "tiny_csv_path",
+        "CSV too narrow: Mapping requires 2 columns, but CSV only has 1.",
+    ),
+]
+
+
+async def run_copy_query(
+    client, table_name, columns, destination_columns, source_filepath
+):
+    await create_table_async(client, table_name, columns)
+
+    query_definition = {
+        "sourceFilepath": source_filepath,
+        "destinationTableName": table_name,
     }
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
-
-    status = wait_for_final_status(query_id)
-    assert status == "FAILED"
-
-    err = get_error_message(query_id)
-    assert err == "Type Error at Row 1, Column 'c2': Expected INT64, got 'abc'"
+    if destination_columns is not None:
+        query_definition["destinationColumns"] = destination_columns
 
-
-def test_fail_csv_too_narrow(server, test_csv_path):
-    tiny_csv = os.path.join(os.getcwd(), "data", "tiny.csv")
-    with open(tiny_csv, "w") as f:
-        f.write("100\n200\n")
-
-    table_name = "csv_narrow"
-    create_table(
-        table_name, [{"name": "c1", "type": "INT64"}, {"name": "c2", "type": "INT64"}]
+    resp = await client.post(
+        QUERY_URL,
+        content=dump_json({"queryDefinition": query_definition}),
+        headers=JSON_HEADERS,
     )
-
-    data = {
-        "queryDefinition": {
-            "sourceFilepath": tiny_csv,
-            "destinationTableName": table_name,
-            "destinationColumns": ["c1", "c2"],
-        }
-    }
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
-
-    status = wait_for_final_status(query_id)
+    assert resp.status_code == 200
+    query_id = parse_json(resp)
+
+    status = await wait_for_final_status_async(client, query_id)
+    if status != "FAILED":
+        return (status, None)
+    problems = await get_query_problems_async(client, query_id)
+    return (status, problems[0]["error"])
+
+
+async def run_copy_queries(source_filepaths):
+    async with httpx.AsyncClient() as client:
+        return await asyncio.gather(
+            *[
+                run_copy_query(client, table_name, columns, mapping, source_filepath)
+                for (table_name, columns, mapping, _, _), source_filepath in zip(
+                    FAILURE_CASES, source_filepaths
+                )
+            ],
+            return_exceptions=True,
+        )
+
+
+@pytest.fixture(scope="module")
+def failure_results(request, server):
+    """Runs every case in FAILURE_CASES concurrently, keyed by table name.
+
+    A case that raised maps to its exception, so only that case fails.
+    """
+    source_filepaths = [request.getfixturevalue(case[3]) for case in FAILURE_CASES]
+    results = asyncio.run(run_copy_queries(source_filepaths))
+    return {case[0]: result for case, result in zip(FAILURE_CASES, results)}
+
+
+@pytest.mark.parametrize(
+    "table_name,expected_err",
+    [(case[0], case[4]) for case in FAILURE_CASES],
+    ids=[case[0] for case in FAILURE_CASES],
+)
+def test_failure_modes(failure_results, table_name, expected_err):
+    result = failure_results[table_name]
+    if isinstance(result, BaseException):
+        raise result
+
+    (status, err) = result
     assert status == "FAILED"
-
-    err = get_error_message(query_id)
-    assert err == "CSV too narrow: Mapping requires 2 columns, but CSV only has 1."
+    assert err == expected_err
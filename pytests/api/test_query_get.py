@@ -1,30 +1,29 @@
-import requests
-from config import BASE_URL, QUERY_STATUSES
-from utils import create_dummy_table
+from config import QUERY_STATUSES, QUERY_URL
+from utils import create_dummy_table, parse_json
 
 
-def test_get_query_select(server):
+def test_get_query_select(server, http):
     table_name = "test_get_query_select"
     create_dummy_table(table_name)
 
     data = {"queryDefinition": {"tableName": table_name}}
-    resp = requests.post(f"{BASE_URL}/query", json=data)
+    resp = http.post(QUERY_URL, json=data)
     assert resp.status_code == 200
-    query_id = resp.json()
+    query_id = parse_json(resp)
 
-    resp = requests.get(f"{BASE_URL}/query/{query_id}")
+    resp = http.get(f"{QUERY_URL}/{query_id}")
     assert resp.status_code == 200
 
-    body = resp.json()
+    body = parse_json(resp)
     assert body["queryId"]
     assert body["status"] in QUERY_STATUSES
     assert body["queryDefinition"]["tableName"] == table_name
 
 
-def test_get_non_existence_query(server):
+def test_get_non_existence_query(server, http):
     query_id = "test_get_non_existence_query"
-    resp = requests.get(f"{BASE_URL}/query/{query_id}")
+    resp = http.get(f"{QUERY_URL}/{query_id}")
     assert resp.status_code == 404
 
-    body = resp.json()
+    body = parse_json(resp)
     assert body["message"] == "Couldn't find a query of given ID"
@@ -1,29 +1,24 @@
-import requests
-from config import BASE_URL, QUERY_STATUSES
+from config import QUERIES_URL, QUERY_STATUSES, QUERY_URL
+from utils import parse_json
 
 
-def test_list_queries_empty(server):
-    resp = requests.get(f"{BASE_URL}/queries")
+def test_list_queries_empty(fresh_server, http):
+    resp = http.get(f"{fresh_server}/queries")
     assert resp.status_code == 200
-    assert resp.json() == []
+    assert parse_json(resp) == []
 
 
-def test_list_queries(server):
-    data = {"name": "test_list_queries", "columns": [
-        {"name": "c1", "type": "INT64"},
-    ]}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
-    assert resp.status_code == 200
+def test_list_queries(server, http, shared_empty_table):
+    (_, table_data) = shared_empty_table
 
-    data = {"queryDefinition": {"tableName": "test_list_queries"}}
-    resp = requests.post(f"{BASE_URL}/query", json=data)
+    data = {"queryDefinition": {"tableName": table_data["name"]}}
+    resp = http.post(QUERY_URL, json=data)
     assert resp.status_code == 200
-    query_id = resp.json()
+    query_id = parse_json(resp)
 
-    resp = requests.get(f"{BASE_URL}/queries")
+    resp = http.get(QUERIES_URL)
     assert resp.status_code == 200
 
-    body = resp.json()
-    assert len(body) == 1
-    assert body[0]["queryId"] == query_id
-    assert body[0]["status"] in QUERY_STATUSES
+    body = parse_json(resp)
+    queries = {query["queryId"]: query for query in body}
+    assert queries[query_id]["status"] in QUERY_STATUSES
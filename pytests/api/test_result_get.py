@@ -1,29 +1,28 @@
-import requests
-from config import BASE_URL
-from utils import create_dummy_table, wait_for_status
+from config import QUERY_URL, RESULT_URL
+from utils import create_dummy_table, parse_json, wait_for_status
 
 
-def test_get_query_result_success(server):
+def test_get_query_result_success(server, http):
     table_name = "test_get_query_result_success"
     (_, table_data) = create_dummy_table(table_name)
 
     data = {"queryDefinition": {"tableName": table_name}}
-    resp = requests.post(f"{BASE_URL}/query", json=data)
-    query_id = resp.json()
+    resp = http.post(QUERY_URL, json=data)
+    query_id = parse_json(resp)
 
     final_status = wait_for_status(query_id, ["COMPLETED"])
     assert final_status == "COMPLETED"
 
-    resp = requests.get(f"{BASE_URL}/result/{query_id}")
+    resp = http.get(f"{RESULT_URL}/{query_id}")
     assert resp.status_code == 200
 
-    body = resp.json()
+    body = parse_json(resp)
     assert len(body) == 1
     assert body[0]["rowCount"] == 0
     assert len(body[0]["columns"]) == len(table_data["columns"])
 
 
-def test_get_result_non_existent(server):
+def test_get_result_non_existent(server, http):
     id = "test_get_result_non_existent"
-    resp = requests.get(f"{BASE_URL}/result/{id}")
+    resp = http.get(f"{RESULT_URL}/{id}")
     assert resp.status_code == 404
@@ -1,15 +1,21 @@
 import time
 
-import requests
-from config import BASE_URL
+from config import SYSTEM_INFO_URL
+from utils import parse_json
 
 
-def test_system_info(server):
-    time.sleep(1)
-    resp = requests.get(f"{BASE_URL}/system/info")
-    assert resp.status_code == 200
+def test_system_info(server, http):
+    # Uptime is reported in whole seconds, so a server started moments ago
+    # reports 0. Wait only for as long as that is actually the case.
+    deadline = time.time() + 2
+    while True:
+        resp = http.get(SYSTEM_INFO_URL)
+        assert resp.status_code == 200
+        body = parse_json(resp)
+        if body["uptime"] > 0 or time.time() > deadline:
+            break
+        time.sleep(0.01)
 
-    body = resp.json()
     assert body["version"]
     assert body["interfaceVersion"]
     assert body["author"] == "Jakub Kłos"
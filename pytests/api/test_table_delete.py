@@ -1,18 +1,17 @@
-import requests
-from config import BASE_URL
-from utils import create_dummy_table
+from config import TABLE_URL
+from utils import create_dummy_table, parse_json
 
 
-def test_delete_table(server):
+def test_delete_table(server, http):
     table_name = "test_delete_table"
     (table_id, _) = create_dummy_table(table_name)
 
-    resp = requests.delete(f"{BASE_URL}/table/{table_id}")
+    resp = http.delete(f"{TABLE_URL}/{table_id}")
     assert resp.status_code == 200
 
 
-def test_delete_non_existence_table(server):
+def test_delete_non_existence_table(server, http):
     id = "test_delete_non_existence_table"
-    resp = requests.delete(f"{BASE_URL}/table/{id}")
+    resp = http.delete(f"{TABLE_URL}/{id}")
     assert resp.status_code == 404
-    assert resp.json() == {"message": "Couldn't find a table of given ID"}
+    assert parse_json(resp) == {"message": "Couldn't find a table of given ID"}
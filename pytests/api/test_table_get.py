@@ -1,47 +1,37 @@
-import requests
-from config import BASE_URL
-
-
-def test_get_table(server):
-    data = {
-        "name": "test_get_table",
-        "columns": [
-            {"name": "col1", "type": "VARCHAR"},
-            {"name": "col2", "type": "INT64"},
-        ],
-    }
-    resp = requests.put(f"{BASE_URL}/table", json=data)
-    assert resp.status_code == 200
-    id = resp.json()
+from config import TABLE_URL
+from utils import as_item_set, parse_json
+
+
+def test_get_table(server, http, shared_empty_table):
+    (id, data) = shared_empty_table
 
-    resp = requests.get(f"{BASE_URL}/table/{id}")
+    resp = http.get(f"{TABLE_URL}/{id}")
     assert resp.status_code == 200
 
-    body = resp.json()
+    body = parse_json(resp)
     assert body["name"] == data["name"]
-    assert sorted(body["columns"], key=lambda x: (x["name"], x["type"])) == sorted(
-        data["columns"], key=lambda x: (x["name"], x["type"])
-    )
+    assert len(body["columns"]) == len(data["columns"])
+    assert as_item_set(body["columns"]) == as_item_set(data["columns"])
 
 
-def test_get_non_existence_table(server):
+def test_get_non_existence_table(server, http):
     id = "test_get_non_existence_table"
-    resp = requests.get(f"{BASE_URL}/table/{id}")
+    resp = http.get(f"{TABLE_URL}/{id}")
     assert resp.status_code == 404
-    assert resp.json() == {"message": "Couldn't find a table of given ID"}
+    assert parse_json(resp) == {"message": "Couldn't find a table of given ID"}
 
 
-def test_get_table_after_delete(server):
+def test_get_table_after_delete(server, http):
     data = {"name": "test_get_table_after_delete", "columns": [
         {"name": "col1", "type": "VARCHAR"},
     ]}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 200
-    id = resp.json()
+    id = parse_json(resp)
 
-    resp = requests.delete(f"{BASE_URL}/table/{id}")
+    resp = http.delete(f"{TABLE_URL}/{id}")
     assert resp.status_code == 200
 
-    resp = requests.get(f"{BASE_URL}/table/{id}")
+    resp = http.get(f"{TABLE_URL}/{id}")
     assert resp.status_code == 404
-    assert resp.json() == {"message": "Couldn't find a table of given ID"}
+    assert parse_json(resp) == {"message": "Couldn't find a table of given ID"}
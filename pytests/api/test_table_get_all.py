@@ -1,23 +1,19 @@
-import requests
-from config import BASE_URL
+from config import TABLES_URL
+from utils import parse_json
 
 
-def test_list_tables_empty(server):
-    resp = requests.get(f"{BASE_URL}/tables")
+def test_list_tables_empty(fresh_server, http):
+    resp = http.get(f"{fresh_server}/tables")
     assert resp.status_code == 200
-    assert resp.json() == []
+    assert parse_json(resp) == []
 
 
-def test_list_tables(server):
-    data = {"name": "test_list_tables", "columns": [
-        {"name": "col1", "type": "VARCHAR"},
-    ]}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
-    assert resp.status_code == 200
+def test_list_tables(server, http, shared_empty_table):
+    (table_id, data) = shared_empty_table
 
-    resp = requests.get(f"{BASE_URL}/tables")
+    resp = http.get(TABLES_URL)
     assert resp.status_code == 200
 
-    body = resp.json()
-    assert body[0]["tableId"]
-    assert body[0]["name"] == "test_list_tables"
+    body = parse_json(resp)
+    tables = {table["tableId"]: table["name"] for table in body}
+    assert tables[table_id] == data["name"]
@@ -1,8 +1,8 @@
-import requests
-from config import BASE_URL
+from config import TABLE_URL
+from utils import as_item_set, parse_json
 
 
-def test_put_table(server):
+def test_put_table(server, http):
     data = {
         "name": "test_put_table",
         "columns": [
@@ -10,27 +10,27 @@ def test_put_table(server):
             {"name": "col2", "type": "VARCHAR"},
         ],
     }
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 200
 
 
-def test_put_table_with_existing_name(server):
+def test_put_table_with_existing_name(server, http):
     data = {"name": "test_put_table_with_existing_name", "columns": [
         {"name": "col1", "type": "INT64"},
     ]}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 200
 
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 400
 
-    body = resp.json()
+    body = parse_json(resp)
     assert body["problems"]
     assert len(body["problems"]) == 1
     assert body["problems"][0]["error"] == "Table with given name already exists"
 
 
-def test_put_table_with_duplicate_column_names(server):
+def test_put_table_with_duplicate_column_names(server, http):
     data = {
         "name": "test_put_table_with_duplicate_column_names",
         "columns": [
@@ -38,21 +38,21 @@ def test_put_table_with_duplicate_column_names(server):
             {"name": "col1", "type": "INT64"},
         ],
     }
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 400
 
-    body = resp.json()
+    body = parse_json(resp)
     assert body["problems"]
     assert len(body["problems"]) == 1
     assert body["problems"][0]["error"] == "Two columns have identical names"
     assert body["problems"][0]["context"] == "col1"
 
 
-def test_put_table_with_multiple_errors(server):
+def test_put_table_with_multiple_errors(server, http):
     data = {"name": "test_put_table_with_multiple_errors", "columns": [
         {"name": "col1", "type": "INT64"},
     ]}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 200
 
     data = {
@@ -66,18 +66,16 @@ def test_put_table_with_multiple_errors(server):
             {"name": "col3", "type": "VARCHAR"},
         ],
     }
-    resp = requests.put(f"{BASE_URL}/table", json=data)
+    resp = http.put(TABLE_URL, json=data)
     assert resp.status_code == 400
 
-    body = resp.json()
-    assert sorted(
-        body["problems"], key=lambda x: (x["error"], x.get("context", ""))
-    ) == sorted(
+    body = parse_json(resp)
+    assert len(body["problems"]) == 4
+    assert as_item_set(body["problems"]) == as_item_set(
         [
             {"error": "Table with given name already exists"},
             {"error": "Two columns have identical names", "context": "col1"},
             {"error": "Two columns have identical names", "context": "col2"},
             {"error": "Two columns have identical names", "context": "col3"},
-        ],
-        key=lambda x: (x["error"], x.get("context", "")),
+        ]
     )
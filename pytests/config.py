@@ -1,2 +1,19 @@
+import os
+
 QUERY_STATUSES = {"CREATED", "PLANNING", "RUNNING", "COMPLETED", "FAILED"}
-BASE_URL = "http://127.0.0.1:8080"
+
+# Each pytest-xdist worker (gw0, gw1, ...) talks to its own server instance.
+SERVER_PORT = 8080 + int(os.environ.get("PYTEST_XDIST_WORKER", "gw0")[2:])
+# Port for throwaway servers that tests needing an empty database start themselves.
+FRESH_SERVER_PORT = SERVER_PORT + 1000
+# Setting API_BASE_URL points the tests at an already running server instead.
+EXTERNAL_SERVER = "API_BASE_URL" in os.environ
+BASE_URL = os.environ.get("API_BASE_URL", f"http://127.0.0.1:{SERVER_PORT}")
+
+QUERY_URL = f"{BASE_URL}/query"
+QUERIES_URL = f"{BASE_URL}/queries"
+TABLE_URL = f"{BASE_URL}/table"
+TABLES_URL = f"{BASE_URL}/tables"
+RESULT_URL = f"{BASE_URL}/result"
+ERROR_URL = f"{BASE_URL}/error"
+SYSTEM_INFO_URL = f"{BASE_URL}/system/info"
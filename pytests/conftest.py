@@ -1,19 +1,145 @@
+import json
 import os
 import pytest
 import time
 import sys
 import subprocess
 
+import requests
+from filelock import FileLock
+
 sys.path.append(os.path.dirname(__file__))
 
-@pytest.fixture(scope="module")
-def server():
-    proc = subprocess.Popen(["cargo", "run"])
+from config import EXTERNAL_SERVER, FRESH_SERVER_PORT, SERVER_PORT
+from utils import create_dummy_table, new_session, unique_table_name
 
-    time.sleep(1)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "simple_rust_dbms"
+SERVER_STARTUP_TIMEOUT = 30
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_FILES = ("test_copy_fails.csv", "tiny.csv")
 
-    yield proc
 
+def server_binary_path():
+    metadata = json.loads(
+        subprocess.check_output(
+            ["cargo", "metadata", "--format-version", "1", "--no-deps"],
+            cwd=PROJECT_ROOT,
+        )
+    )
+    return os.path.join(metadata["target_directory"], "release", PACKAGE_NAME)
+
+
+def wait_for_server(proc, base_url, timeout=SERVER_STARTUP_TIMEOUT):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            resp = requests.get(f"{base_url}/system/info", timeout=1)
+            if resp.status_code == 200:
+                return
+        except (requests.ConnectionError, requests.Timeout):
+            pass
+        time.sleep(0.1)
+    raise TimeoutError(f"Server did not become ready in {timeout}s")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _built_server_binary(tmp_path_factory):
+    if EXTERNAL_SERVER:
+        return None
+
+    # The base temp dir is shared by all xdist workers, so this lock makes
+    # them build one after another and all but the first find it up to date.
+    lock_path = tmp_path_factory.getbasetemp().parent / "cargo-build.lock"
+    with FileLock(str(lock_path)):
+        subprocess.check_call(
+            ["cargo", "build", "--release", "--bin", PACKAGE_NAME], cwd=PROJECT_ROOT
+        )
+    return server_binary_path()
+
+
+def start_server(binary, port, workdir):
+    # Separate working dir per server so metastore.json and tables/ are not shared.
+    os.makedirs(workdir / "tables", exist_ok=True)
+    proc = subprocess.Popen(
+        [binary, "--bind", f"127.0.0.1:{port}"],
+        cwd=workdir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        wait_for_server(proc, f"http://127.0.0.1:{port}")
+    except Exception:
+        proc.kill()
+        proc.wait()
+        raise
+
+    return proc
+
+
+def stop_server(proc):
     proc.terminate()
-    proc.wait()
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+@pytest.fixture(scope="session")
+def server(_built_server_binary, tmp_path_factory):
+    if EXTERNAL_SERVER:
+        yield None
+        return
+
+    proc = start_server(
+        _built_server_binary, SERVER_PORT, tmp_path_factory.mktemp("server")
+    )
+    yield proc
+    stop_server(proc)
+
+
+@pytest.fixture
+def fresh_server(_built_server_binary, tmp_path_factory):
+    """Base URL of a server started for this test alone, with no tables or queries."""
+    if EXTERNAL_SERVER:
+        pytest.skip("needs a fresh local server, but API_BASE_URL is set")
+
+    proc = start_server(
+        _built_server_binary, FRESH_SERVER_PORT, tmp_path_factory.mktemp("fresh")
+    )
+    yield f"http://127.0.0.1:{FRESH_SERVER_PORT}"
+    stop_server(proc)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fixture_files_exist():
+    for name in FIXTURE_FILES:
+        path = os.path.join(FIXTURES_DIR, name)
+        assert os.path.isfile(path), f"Missing test fixture file: {path}"
+
+
+@pytest.fixture(scope="session")
+def test_csv_path():
+    return os.path.join(FIXTURES_DIR, "test_copy_fails.csv")
+
+
+@pytest.fixture(scope="session")
+def tiny_csv_path():
+    return os.path.join(FIXTURES_DIR, "tiny.csv")
+
+
+@pytest.fixture(scope="session")
+def http():
+    session = new_session()
+    yield session
+    session.close()
+
 
+@pytest.fixture(scope="session")
+def shared_empty_table(server):
+    """A table for read-only tests; must not be modified or deleted."""
+    return create_dummy_table(unique_table_name("shared"))
@@ -1,11 +1,46 @@
+import asyncio
+import json
+import random
 import time
-from typing import List, Literal, Tuple, TypedDict
+import uuid
+from typing import Any, List, Literal, Tuple, TypedDict
 
 import requests
-from config import BASE_URL
+import urllib3
+from config import ERROR_URL, QUERY_URL, TABLE_URL
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 QueryStatus = Literal["CREATED", "PLANNING", "RUNNING", "COMPLETED", "FAILED"]
 
+# The helpers below are called far more often than anything in the tests
+# themselves, so they skip requests and talk to urllib3 directly.
+_POOL = urllib3.PoolManager(num_pools=1, maxsize=8, retries=False)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def new_session() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+    return session
+
+
+def parse_json(resp) -> Any:
+    body = resp.data if isinstance(resp, urllib3.BaseHTTPResponse) else resp.content
+    if orjson is None:
+        return json.loads(body)
+    return orjson.loads(body)
+
+
+def dump_json(data) -> bytes:
+    if orjson is None:
+        return json.dumps(data).encode()
+    return orjson.dumps(data)
+
 
 class Column(TypedDict):
     name: str
@@ -17,6 +52,20 @@ class Table(TypedDict):
     columns: List[Column]
 
 
+class Problem(TypedDict, total=False):
+    error: str
+    context: str
+
+
+def as_item_set(dicts) -> set:
+    """Order-independent but exact view of a list of flat dicts, keys included."""
+    return {tuple(sorted(d.items())) for d in dicts}
+
+
+def unique_table_name(prefix) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:8]}"
+
+
 def create_dummy_table(name) -> Tuple[str, Table]:
     data: Table = {
         "name": name,
@@ -25,40 +74,147 @@ def create_dummy_table(name) -> Tuple[str, Table]:
             {"name": "col2", "type": "VARCHAR"},
         ],
     }
-    resp = requests.put(f"{BASE_URL}/table", json=data)
-    assert resp.status_code == 200
-    table_id = resp.json()
-    return (table_id, data)
+    return (create_table(name, data["columns"]), data)
 
 
 def create_table(name, columns) -> str:
     data = {"name": name, "columns": columns}
-    resp = requests.put(f"{BASE_URL}/table", json=data)
-    assert resp.status_code == 200
-    table_id = resp.json()
+    resp = _POOL.request("PUT", TABLE_URL, body=dump_json(data), headers=JSON_HEADERS)
+    assert resp.status == 200
+    table_id = parse_json(resp)
     return table_id
 
 
-def wait_for_status(query_id, target_statuses, timeout=5) -> QueryStatus:
+POLL_INITIAL_DELAY = 0.005
+POLL_MAX_DELAY = 0.1
+
+_long_poll_supported = True
+
+
+def _not_reached_error(query_id, target_statuses, timeout) -> TimeoutError:
+    return TimeoutError(
+        f"Query {query_id} did not reach status {target_statuses} in {timeout}s"
+    )
+
+
+def _long_poll_url(query_id) -> str:
+    return f"{QUERY_URL}/{query_id}/wait"
+
+
+def _long_poll_params(target_statuses, timeout) -> dict:
+    return {"target": ",".join(target_statuses), "timeout": f"{timeout}s"}
+
+
+def _long_poll_result(status_code, resp, query_id, target_statuses, timeout):
+    """Interprets a long-poll response; None means the endpoint is unavailable."""
+    global _long_poll_supported
+    if status_code == 404:
+        _long_poll_supported = False
+        return None
+
+    assert status_code == 200
+    current_status = parse_json(resp)["status"]
+    if current_status not in target_statuses:
+        raise _not_reached_error(query_id, target_statuses, timeout)
+    return current_status
+
+
+def _query_status(status_code, resp) -> QueryStatus:
+    assert status_code == 200
+    return parse_json(resp)["status"]
+
+
+def _poll_delays(timeout):
+    """Yields jittered, exponentially growing sleeps until timeout has elapsed."""
     start = time.time()
+    delay = POLL_INITIAL_DELAY
     while time.time() - start < timeout:
-        resp = requests.get(f"{BASE_URL}/query/{query_id}")
-        assert resp.status_code == 200
-        current_status = resp.json()["status"]
+        yield random.uniform(delay / 2, delay)
+        delay = min(POLL_MAX_DELAY, delay * 2)
+
+
+def wait_for_status_long_poll(query_id, target_statuses, timeout=5):
+    """Blocks on the server until the query reaches one of target_statuses.
+
+    Returns None if the server does not expose the long-poll endpoint.
+    """
+    if not _long_poll_supported:
+        return None
+
+    resp = _POOL.request(
+        "GET",
+        _long_poll_url(query_id),
+        fields=_long_poll_params(target_statuses, timeout),
+        timeout=timeout + 1,
+    )
+    return _long_poll_result(resp.status, resp, query_id, target_statuses, timeout)
+
+
+def wait_for_status(query_id, target_statuses, timeout=5) -> QueryStatus:
+    status = wait_for_status_long_poll(query_id, target_statuses, timeout)
+    if status is not None:
+        return status
+
+    url = f"{QUERY_URL}/{query_id}"
+    for delay in _poll_delays(timeout):
+        resp = _POOL.request("GET", url)
+        current_status = _query_status(resp.status, resp)
         if current_status in target_statuses:
             return current_status
-        time.sleep(0.1)
-    raise TimeoutError(
-        f"Query {query_id} did not reach status {target_statuses} in {timeout}s"
-    )
+        time.sleep(delay)
+    raise _not_reached_error(query_id, target_statuses, timeout)
 
 
 def wait_for_final_status(query_id) -> QueryStatus:
     return wait_for_status(query_id, ["COMPLETED", "FAILED"])
 
 
-def get_error_message(query_id):
-    resp = requests.get(f"{BASE_URL}/error/{query_id}")
+async def create_table_async(client, name, columns) -> str:
+    data = {"name": name, "columns": columns}
+    resp = await client.put(TABLE_URL, content=dump_json(data), headers=JSON_HEADERS)
+    assert resp.status_code == 200
+    return parse_json(resp)
+
+
+async def wait_for_status_long_poll_async(client, query_id, target_statuses, timeout=5):
+    """Async counterpart of wait_for_status_long_poll, sharing its 404 fallback."""
+    if not _long_poll_supported:
+        return None
+
+    resp = await client.get(
+        _long_poll_url(query_id),
+        params=_long_poll_params(target_statuses, timeout),
+        timeout=timeout + 1,
+    )
+    return _long_poll_result(
+        resp.status_code, resp, query_id, target_statuses, timeout
+    )
+
+
+async def wait_for_status_async(
+    client, query_id, target_statuses, timeout=5
+) -> QueryStatus:
+    status = await wait_for_status_long_poll_async(
+        client, query_id, target_statuses, timeout
+    )
+    if status is not None:
+        return status
+
+    url = f"{QUERY_URL}/{query_id}"
+    for delay in _poll_delays(timeout):
+        resp = await client.get(url)
+        current_status = _query_status(resp.status_code, resp)
+        if current_status in target_statuses:
+            return current_status
+        await asyncio.sleep(delay)
+    raise _not_reached_error(query_id, target_statuses, timeout)
+
+
+async def wait_for_final_status_async(client, query_id) -> QueryStatus:
+    return await wait_for_status_async(client, query_id, ["COMPLETED", "FAILED"])
+
+
+async def get_query_problems_async(client, query_id) -> List[Problem]:
+    resp = await client.get(f"{ERROR_URL}/{query_id}")
     assert resp.status_code == 200
-    body = resp.json()
-    return body["problems"][0]["error"]
+    return parse_json(resp)["problems"]
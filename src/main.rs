@@ -24,9 +24,18 @@ async fn main() {
                 .long("https")
                 .help("Whether to use HTTPS or not"),
         )
+        .arg(
+            Arg::new("bind")
+                .long("bind")
+                .default_value("0.0.0.0:8080")
+                .help("Address to listen on"),
+        )
         .get_matches();
 
-    let addr = "0.0.0.0:8080";
+    let addr = matches
+        .get_one::<String>("bind")
+        .expect("bind has a default value")
+        .clone();
 
     let serializer = Serializer::new();
 
@@ -29,7 +29,7 @@ use tokio::sync::RwLock;
 #[cfg(not(any(target_os = "macos", target_os = "windows", target_os = "ios")))]
 use openssl::ssl::{Ssl, SslAcceptor, SslFiletype, SslMethod};
 
-pub async fn create(addr: &str, https: bool, metastore: SharedMetastore) {
+pub async fn create(addr: String, https: bool, metastore: SharedMetastore) {
     let addr: SocketAddr = addr.parse().expect("Failed to parse bind address");
     let listener = TcpListener::bind(&addr).await.unwrap();
 